@@ -1,3 +1,5 @@
+import os
+
 from pydantic import BaseModel, Field
 from agents import Agent
 
@@ -26,6 +28,6 @@ class ClarifyingQuestions(BaseModel):
 clarifier_agent = Agent(
     name="ClarifierAgent",
     instructions=INSTRUCTIONS,
-    model="gpt-4o",
+    model=os.environ.get("CLARIFIER_MODEL", "gpt-4o-mini"),
     output_type=ClarifyingQuestions,
 )
@@ -1,9 +1,16 @@
+import asyncio
+import itertools
+
 import gradio as gr
 from dotenv import load_dotenv
-from research_manager import ResearchManager
 
+# Load .env before importing the agents, which read their model choices from the environment
 load_dotenv(override=True)
 
+from research_manager import ResearchManager, RunContext
+
+# The manager is stateless and shared; per-run state lives in a RunContext
+# created for each call, just as Gradio's State isolates each session's `state`.
 manager = ResearchManager()
 
 # State machine: "idle" → "clarifying" → "researching" → "done"
@@ -17,6 +24,7 @@ async def handle_submit(user_message: str, chat_history: list, state: dict):
         return
 
     phase = state.get("phase", "idle")
+    ctx = RunContext()
 
     if phase == "idle":
         # ── New research query ──
@@ -29,8 +37,12 @@ async def handle_submit(user_message: str, chat_history: list, state: dict):
         })
         yield chat_history, state, ""
 
+        # Most users skip or answer briefly, so plan the searches for the bare query
+        # while they read the questions; the plan is discarded if they add context.
+        state["speculative_plan_task"] = asyncio.create_task(manager.plan(ctx, user_message))
+
         # Generate clarifying questions
-        questions = await manager.clarify(user_message)
+        questions = await manager.clarify(ctx, user_message)
         questions_text = "Before I dive in, I have a few questions to sharpen my research:\n\n"
         for i, q in enumerate(questions.questions, 1):
             questions_text += f"**{i}.** {q}\n\n"
@@ -46,10 +58,14 @@ async def handle_submit(user_message: str, chat_history: list, state: dict):
         # ── User answering clarifying questions ──
         chat_history.append({"role": "user", "content": user_message})
 
+        speculative_plan_task = state.pop("speculative_plan_task", None)
         if user_message.strip().lower() == "skip":
             clarification_answers = ""
         else:
             clarification_answers = user_message
+            if speculative_plan_task is not None:
+                speculative_plan_task.cancel()
+                speculative_plan_task = None
 
         state["phase"] = "researching"
         chat_history.append({
@@ -58,19 +74,40 @@ async def handle_submit(user_message: str, chat_history: list, state: dict):
         })
         yield chat_history, state, ""
 
+        search_plan = None
+        if speculative_plan_task is not None:
+            try:
+                search_plan = await speculative_plan_task
+            except Exception as e:
+                print(f"Speculative search planning failed: {e}")
+
         # ── Run the full autonomous research pipeline ──
-        status_messages = []
-        async for update in manager.run(state["query"], clarification_answers):
+        state["progress_md"] = PROGRESS_HEADER
+        progress = ""
+        draft = ""
+        streaming_draft = False
+        async for update in manager.run(ctx, state["query"], clarification_answers, search_plan):
             if update["type"] == "status":
-                status_messages.append(update["content"])
-                # Build a rich progress display
-                progress = _build_progress_display(status_messages)
-                chat_history[-1] = {"role": "assistant", "content": progress}
+                streaming_draft = False
+                # Extend the rich progress display with just the new update
+                state["progress_md"] += _format_status(update["content"])
+                progress = state["progress_md"] + PROGRESS_FOOTER
+                chat_history[-1] = {"role": "assistant", "content": _with_draft(progress, draft)}
+                yield chat_history, state, ""
+
+            elif update["type"] == "token":
+                # Stream the report draft below the progress display as it is written
+                if not streaming_draft:
+                    draft = ""
+                    streaming_draft = True
+                draft += update["content"]
+                chat_history[-1] = {"role": "assistant", "content": _with_draft(progress, draft)}
                 yield chat_history, state, ""
 
             elif update["type"] == "report":
-                # Show the final report
+                # Show the final report (replacing the streamed preview)
                 state["phase"] = "done"
+                chat_history[-1] = {"role": "assistant", "content": progress}
                 chat_history.append({
                     "role": "assistant",
                     "content": update["content"],
@@ -95,20 +132,21 @@ async def handle_submit(user_message: str, chat_history: list, state: dict):
             yield result
 
 
-def _build_progress_display(status_messages: list[str]) -> str:
-    """Build a nicely formatted progress display from status updates."""
-    lines = ["**Deep Research in Progress**\n"]
-    for msg in status_messages:
-        if "\n" in msg:
-            first_line, *rest = msg.split("\n")
-            lines.append(f"> {first_line}")
-            for line in rest:
-                lines.append(f"  {line}")
-        else:
-            lines.append(f"> {msg}")
+PROGRESS_HEADER = "**Deep Research in Progress**\n"
+PROGRESS_FOOTER = "\n\n\n*Working...*"
+
+
+def _format_status(msg: str) -> str:
+    """Format one status update as the segment appended to the progress display."""
+    first_line, *rest = msg.split("\n")
+    return "".join(itertools.chain([f"\n\n> {first_line}"], (f"\n\n  {line}" for line in rest)))
+
 
-    lines.append("\n*Working...*")
-    return "\n\n".join(lines)
+def _with_draft(progress: str, draft: str) -> str:
+    """Append the report draft being written (if any) to the progress display."""
+    if not draft:
+        return progress
+    return f"{progress}\n\n---\n\n**Draft preview**\n\n{draft}"
 
 
 # ── Gradio UI (compatible with Gradio 6+) ──
@@ -0,0 +1,9 @@
+import os
+
+from diskcache import Cache
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".research_cache")
+
+# One on-disk store shared by the LLM and semantic caches. diskcache is backed by SQLite
+# in WAL mode, so it persists across restarts and is safe to share between worker processes.
+disk_cache = Cache(CACHE_DIR, eviction_policy="least-recently-used", size_limit=2 * 1024**3)
@@ -0,0 +1,26 @@
+import numpy as np
+from openai import AsyncOpenAI
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+_client: AsyncOpenAI | None = None
+
+
+def _get_client() -> AsyncOpenAI:
+    """Lazily create the OpenAI client so importing this module never needs an API key."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI()
+    return _client
+
+
+async def embed_texts(texts: list[str]) -> np.ndarray:
+    """Embed a batch of texts in a single API call.
+
+    Returns a float32 matrix of shape (len(texts), dim) with L2-normalized rows,
+    so cosine similarity is a plain dot product.
+    """
+    response = await _get_client().embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    vectors = np.array([d.embedding for d in response.data], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
@@ -1,10 +1,14 @@
-from pydantic import BaseModel, Field
+import os
+
+from pydantic import BaseModel, Field, PrivateAttr
 from agents import Agent
 
+from planner_agent import WebSearchItem, WebSearchPlan
+
 INSTRUCTIONS = """You are a rigorous research quality evaluator. You will be given:
 - The original research query (with any clarifications)
 - A draft research report
-- The search results that were used to create the report
+- An evidence card for each search used to create the report: its leading key facts, sources and dates
 
 Your job is to critically evaluate the report and decide whether it meets the bar for a \
 comprehensive, production-quality deep research output.
@@ -22,6 +26,10 @@ If the report is NOT acceptable, you MUST provide:
 - `gaps`: Specific topics or questions that are missing from the report
 - `additional_search_queries`: 3-5 new search queries that would fill the gaps
 - `revision_instructions`: Specific instructions for the writer on how to improve the report
+- `next_plan`: 3-5 highly targeted web searches that fill the gaps, each with a clear, specific \
+query and the reason it is needed. Prefer data, expert analysis, recent developments and \
+counterarguments the report lacks. Do NOT repeat searches already covered by the findings \
+you were given. Leave `next_plan` empty when the report is acceptable.
 
 Be demanding. A good deep research report should rival what a human analyst would produce \
 after hours of work. Surface-level summaries should score low on Depth and Insight.
@@ -48,11 +56,96 @@ class EvaluationResult(BaseModel):
         default="",
         description="Specific instructions for improving the report"
     )
+    # Unrounded per-dimension means when this evaluation merges several; not part of the schema
+    _mean_scores: dict[str, float] | None = PrivateAttr(default=None)
+
+
+class EvaluationWithPlan(EvaluationResult):
+    """An evaluation that also carries the searches to run next, so no separate planning call is needed."""
+
+    next_plan: WebSearchPlan | None = Field(
+        default=None,
+        description="3-5 targeted searches that fill the gaps; only set when the report is not acceptable",
+    )
+
+
+MAX_REFINEMENT_SEARCHES = 5
+
+SCORE_FIELDS = ("completeness_score", "depth_score", "accuracy_score", "structure_score", "insight_score")
+
+# Two cheap evaluations are run and compared; if they disagree by more than
+# MAX_SCORE_DISAGREEMENT on any dimension, the report is re-evaluated with ESCALATION_MODEL.
+EVALUATOR_MODEL = os.environ.get("EVALUATOR_MODEL", "gpt-4o-mini")
+ESCALATION_MODEL = os.environ.get("EVALUATOR_ESCALATION_MODEL", "gpt-4o")
+MAX_SCORE_DISAGREEMENT = 2
+
+
+def _scores(evaluation: EvaluationResult) -> dict[str, float]:
+    """Per-dimension scores, unrounded if the evaluation is a merge of several."""
+    if evaluation._mean_scores is not None:
+        return evaluation._mean_scores
+    return {f: getattr(evaluation, f) for f in SCORE_FIELDS}
+
+
+def average_score(evaluation: EvaluationResult) -> float:
+    return sum(_scores(evaluation).values()) / len(SCORE_FIELDS)
+
+
+def format_scores(evaluation: EvaluationResult) -> str:
+    """One-line score summary, showing the same unrounded averages the pass rule judged."""
+    return " | ".join(
+        f"{f.removesuffix('_score').capitalize()}: {score:g}/10" for f, score in _scores(evaluation).items()
+    )
+
+
+def scores_disagree(a: EvaluationResult, b: EvaluationResult) -> bool:
+    """True if two evaluations differ by more than MAX_SCORE_DISAGREEMENT on any dimension."""
+    return any(abs(getattr(a, f) - getattr(b, f)) > MAX_SCORE_DISAGREEMENT for f in SCORE_FIELDS)
+
+
+def merge_evaluations(a: EvaluationWithPlan, b: EvaluationWithPlan) -> EvaluationWithPlan:
+    """
+    Combine two independent evaluations: scores are averaged, and the pass rule is
+    applied to the unrounded averages, which are kept alongside the int fields (rounded
+    half up); gaps and suggested searches are unioned; the written feedback comes from
+    the stricter of the two, whose planned searches are taken first.
+    """
+    stricter = a if average_score(a) <= average_score(b) else b
+    means = {f: (getattr(a, f) + getattr(b, f)) / 2 for f in SCORE_FIELDS}
+    # Judge the unrounded means; rounding first (half-to-even at that) can flip the verdict
+    is_acceptable = sum(means.values()) / len(means) >= 7 and min(means.values()) >= 5
+    scores = {f: int(mean + 0.5) for f, mean in means.items()}
+    lenient = b if stricter is a else a
+    searches: dict[str, WebSearchItem] = {}
+    for evaluation in (stricter, lenient):
+        for item in evaluation.next_plan.searches if evaluation.next_plan else []:
+            searches.setdefault(item.query.strip().lower(), item)
+    next_plan = (
+        None
+        if is_acceptable or not searches
+        else WebSearchPlan(searches=list(searches.values())[:MAX_REFINEMENT_SEARCHES])
+    )
+    merged = EvaluationWithPlan(
+        **scores,
+        summary_of_evaluation=stricter.summary_of_evaluation,
+        is_acceptable=is_acceptable,
+        gaps=list(dict.fromkeys(a.gaps + b.gaps)),
+        additional_search_queries=list(dict.fromkeys(a.additional_search_queries + b.additional_search_queries)),
+        revision_instructions=stricter.revision_instructions,
+        next_plan=next_plan,
+    )
+    merged._mean_scores = means
+    return merged
 
 
 evaluator_agent = Agent(
     name="EvaluatorAgent",
     instructions=INSTRUCTIONS,
-    model="gpt-4o",
-    output_type=EvaluationResult,
+    model=EVALUATOR_MODEL,
+    output_type=EvaluationWithPlan,
 )
+
+# The second self-consistency sample; its own name keeps its LLM cache entry separate
+second_evaluator_agent = evaluator_agent.clone(name="SecondEvaluatorAgent")
+
+escalation_evaluator_agent = evaluator_agent.clone(name="EscalationEvaluatorAgent", model=ESCALATION_MODEL)
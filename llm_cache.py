@@ -0,0 +1,113 @@
+import hashlib
+
+import orjson
+from agents import Agent, Runner, Usage
+from diskcache import Cache
+from openai.types.responses import ResponseTextDeltaEvent
+
+from disk_cache import disk_cache
+
+LLM_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def cache_key(agent_name: str, model: str, instructions: str, input_text: str) -> str:
+    """SHA-256 hex digest identifying one deterministic agent call."""
+    payload = orjson.dumps(
+        {"agent": agent_name, "model": model, "instructions": instructions, "input": input_text},
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+class LLMCache:
+    """
+    Exact-match cache of structured agent outputs, persisted in the shared on-disk store.
+
+    Only use this for agents whose output is a pure function of their prompt
+    (structured `output_type`, no side-effecting tools) — never for search or email.
+    """
+
+    def __init__(self, store: Cache = disk_cache, ttl_seconds: float = LLM_CACHE_TTL_SECONDS):
+        self._store = store
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    def get(self, key: str) -> tuple[str, int] | None:
+        """Return (output_json, tokens_used_when_stored) for a key, or None on a miss."""
+        entry = self._store.get(("llm", key))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.tokens_saved += entry["tokens"]
+        return entry["output"], entry["tokens"]
+
+    def put(self, key: str, agent_name: str, output_json: str, tokens: int) -> None:
+        self._store.set(
+            ("llm", key),
+            {"agent": agent_name, "output": output_json, "tokens": tokens},
+            expire=self.ttl_seconds,
+        )
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return f"{self.hits}/{total} hits ({hit_rate:.0%}), {self.tokens_saved} tokens saved"
+
+
+llm_cache = LLMCache()
+
+
+def agent_cache_key(agent: Agent, input_text: str) -> str:
+    return cache_key(agent.name, str(agent.model), str(agent.instructions), input_text)
+
+
+def _log_usage(agent: Agent, usage: Usage) -> int:
+    """Log how much of the prompt OpenAI served from its prompt cache; return total tokens."""
+    cached_tokens = usage.input_tokens_details.cached_tokens
+    print(f"{agent.name}: {usage.input_tokens} input tokens ({cached_tokens} cached), {usage.output_tokens} output")
+    return usage.total_tokens
+
+
+async def cached_run(agent: Agent, input_text: str, cache: LLMCache = llm_cache):
+    """Run an agent with a structured `output_type`, serving repeated prompts from the cache."""
+    key = agent_cache_key(agent, input_text)
+    cached = cache.get(key)
+    if cached is not None:
+        output_json, tokens = cached
+        print(f"LLM cache hit for {agent.name} (saved {tokens} tokens; {cache.stats()})")
+        return agent.output_type.model_validate_json(output_json)
+
+    result = await Runner.run(agent, input_text)
+    output = result.final_output_as(agent.output_type)
+    tokens = _log_usage(agent, result.context_wrapper.usage)
+    cache.put(key, agent.name, output.model_dump_json(), tokens)
+    return output
+
+
+async def cached_run_streamed(agent: Agent, input_text: str, cache: LLMCache = llm_cache):
+    """
+    Streaming variant of `cached_run`.
+
+    Yields {"type": "delta", "content": str} for each raw text delta the model emits
+    (the JSON of the structured output), then {"type": "output", "content": output}.
+    A cache hit yields only the output event.
+    """
+    key = agent_cache_key(agent, input_text)
+    cached = cache.get(key)
+    if cached is not None:
+        output_json, tokens = cached
+        print(f"LLM cache hit for {agent.name} (saved {tokens} tokens; {cache.stats()})")
+        yield {"type": "output", "content": agent.output_type.model_validate_json(output_json)}
+        return
+
+    result = Runner.run_streamed(agent, input_text)
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+            yield {"type": "delta", "content": event.data.delta}
+    output = result.final_output_as(agent.output_type)
+    tokens = _log_usage(agent, result.context_wrapper.usage)
+    cache.put(key, agent.name, output.model_dump_json(), tokens)
+    yield {"type": "output", "content": output}
@@ -35,9 +35,17 @@ class WebSearchPlan(BaseModel):
     )
 
 
+# How many searches to plan is stated in the user message, not the instructions, so both
+# planners share a byte-identical system prompt and benefit from OpenAI prompt caching.
+INITIAL_PLAN_REQUEST = f"You should output exactly {HOW_MANY_SEARCHES} search queries."
+REFINEMENT_PLAN_REQUEST = (
+    "You should output 3-5 highly targeted search queries that address the specific gaps identified."
+)
+
+
 planner_agent = Agent(
     name="PlannerAgent",
-    instructions=INSTRUCTIONS + f"\n\nYou should output exactly {HOW_MANY_SEARCHES} search queries.",
+    instructions=INSTRUCTIONS,
     model="gpt-4o",
     output_type=WebSearchPlan,
 )
@@ -45,7 +53,7 @@ planner_agent = Agent(
 # A variant for follow-up/refinement searches (fewer, more targeted)
 refinement_planner_agent = Agent(
     name="RefinementPlannerAgent",
-    instructions=INSTRUCTIONS + "\n\nYou should output 3-5 highly targeted search queries that address the specific gaps identified.",
+    instructions=INSTRUCTIONS,
     model="gpt-4o",
     output_type=WebSearchPlan,
 )
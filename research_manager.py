@@ -6,15 +6,175 @@ if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
 import asyncio
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from pydantic import ValidationError
 from agents import Runner, trace, gen_trace_id
 from clarifier_agent import clarifier_agent, ClarifyingQuestions
-from planner_agent import planner_agent, refinement_planner_agent, WebSearchItem, WebSearchPlan
-from search_agent import search_agent
+from planner_agent import (
+    planner_agent,
+    refinement_planner_agent,
+    INITIAL_PLAN_REQUEST,
+    REFINEMENT_PLAN_REQUEST,
+    WebSearchItem,
+    WebSearchPlan,
+)
+from search_agent import search_agent, SearchSummary
 from writer_agent import writer_agent, ReportData
-from evaluator_agent import evaluator_agent, EvaluationResult
+from evaluator_agent import (
+    evaluator_agent,
+    second_evaluator_agent,
+    escalation_evaluator_agent,
+    average_score,
+    format_scores,
+    merge_evaluations,
+    scores_disagree,
+    EvaluationResult,
+    EvaluationWithPlan,
+    MAX_REFINEMENT_SEARCHES,
+)
 from email_agent import email_agent
+from semantic_cache import SemanticCache, search_cache
+from embeddings import embed_texts
+from llm_cache import LLMCache, llm_cache, cached_run, cached_run_streamed
 
 MAX_RESEARCH_ITERATIONS = 3
+MAX_CONCURRENT_SEARCHES = 5
+MIN_USEFUL_RESULTS = 5  # Results needed before slow searches may be cut short
+SEARCH_SOFT_TIMEOUT_SECONDS = 30
+SEARCH_HARD_TIMEOUT_SECONDS = 120
+DUPLICATE_SEARCH_THRESHOLD = 0.9  # Cosine similarity above which a planned search is redundant
+
+
+def _unique_searches(search_plan: WebSearchPlan, limit: int) -> WebSearchPlan:
+    """Drop searches that repeat a query earlier in the same plan and keep at most `limit`."""
+    searches: dict[str, WebSearchItem] = {}
+    for item in search_plan.searches:
+        searches.setdefault(item.query.strip().lower(), item)
+    return WebSearchPlan(searches=list(searches.values())[:limit])
+
+
+def _evidence_cards(results: list[SearchSummary]) -> str:
+    """
+    Evidence cards for every source, numbered as in the writer's input. The cards are
+    small enough to send for every source; the full structured fields go only to the writer.
+    """
+    return "\n\n".join(f"--- Source {i} ---\n{r.evidence_card()}" for i, r in enumerate(results, 1))
+
+
+def _cut_short_note(ctx: "RunContext") -> str:
+    """Prompt suffix listing searches cancelled for running too long, if there are any."""
+    if not ctx.cut_short_queries:
+        return ""
+    return (
+        "\n\nThese earlier searches were cancelled before returning; "
+        "plan them again only if they would still fill a gap:\n"
+        + "\n".join(f"- {q}" for q in ctx.cut_short_queries)
+    )
+
+
+@dataclass
+class RunContext:
+    """
+    Per-run state for one research session.
+
+    ResearchManager itself holds no state, so a single instance can serve concurrent
+    Gradio sessions; each session creates its own RunContext. The caches are shared
+    across sessions by default, since their contents are not session-specific.
+    """
+
+    max_concurrency: int = MAX_CONCURRENT_SEARCHES
+    # All search results gathered so far, accumulating across iterations
+    results: list[SearchSummary] = field(default_factory=list)
+    # Embeddings of executed queries and result summaries, used to drop duplicate searches
+    embeddings: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    executed_queries: set[str] = field(default_factory=set)
+    # Query embeddings the search cache computed this round, reused for the matrix above
+    query_embeddings: dict[str, np.ndarray] = field(default_factory=dict)
+    # Searches cancelled for running too long, offered to the refinement planner for retry
+    cut_short_queries: list[str] = field(default_factory=list)
+    cache: LLMCache = field(default_factory=lambda: llm_cache)
+    search_cache: SemanticCache = field(default_factory=lambda: search_cache)
+    sem: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self):
+        # Bound in-flight searches so rate limits don't push calls into slow retries
+        self.sem = asyncio.Semaphore(self.max_concurrency)
+
+
+_WORD_PATTERN = re.compile(r"\S+")
+
+
+def _word_count(text: str) -> int:
+    """Count whitespace-separated words in one pass without building a list."""
+    return sum(1 for _ in _WORD_PATTERN.finditer(text))
+
+
+class _JsonStringFieldStream:
+    """
+    Incrementally decodes one string field out of a JSON object that arrives in chunks,
+    so a structured output can be shown to the user while it is still being generated.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, field: str):
+        self._key_pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._pos = 0
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a raw chunk and return any newly decoded text of the field."""
+        self._buffer += chunk
+        if self.finished:
+            return ""
+        if not self.started:
+            match = self._key_pattern.search(self._buffer)
+            if match is None:
+                return ""
+            self.started = True
+            self._pos = match.end()
+
+        out = []
+        buf, i = self._buffer, self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.finished = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # Escape sequence: wait for the rest of it if it is split across chunks
+            if i + 1 >= len(buf):
+                break
+            esc = buf[i + 1]
+            if esc == "u":
+                if i + 6 > len(buf):
+                    break
+                code = int(buf[i + 2:i + 6], 16)
+                if 0xD800 <= code < 0xDC00:
+                    # High surrogate: decode together with the low surrogate that follows
+                    if i + 12 > len(buf):
+                        break
+                    low = int(buf[i + 8:i + 12], 16)
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                    i += 6
+                out.append(chr(code))
+                i += 6
+            else:
+                out.append(self._ESCAPES.get(esc, esc))
+                i += 2
+        self._pos = i
+        return "".join(out)
 
 
 class ResearchManager:
@@ -33,23 +193,31 @@ class ResearchManager:
     whether its output is good enough, and if not, it identifies gaps and does more research.
     """
 
-    async def clarify(self, query: str):
+    async def clarify(self, ctx: RunContext, query: str) -> ClarifyingQuestions:
         """Phase 1: Generate clarifying questions for the user."""
         print("Generating clarifying questions...")
-        result = await Runner.run(
-            clarifier_agent,
-            f"Research query: {query}",
-        )
-        return result.final_output_as(ClarifyingQuestions)
+        return await cached_run(clarifier_agent, f"Research query: {query}", cache=ctx.cache)
+
+    async def plan(self, ctx: RunContext, query: str) -> WebSearchPlan:
+        """Phase 2: Plan the initial searches (can be started before `run`, e.g. speculatively)."""
+        return await self._plan_searches(ctx, query)
 
-    async def run(self, query: str, clarification_answers: str = ""):
+    async def run(
+        self,
+        ctx: RunContext,
+        query: str,
+        clarification_answers: str = "",
+        search_plan: WebSearchPlan | None = None,
+    ):
         """
         Run the full autonomous research pipeline.
         Yields status updates and the final report.
 
         Args:
+            ctx: Per-session state for this run
             query: The original research query
             clarification_answers: User's answers to clarifying questions (if any)
+            search_plan: An initial search plan made ahead of time (planned here if None)
         """
         trace_id = gen_trace_id()
         with trace("Deep Research", trace_id=trace_id):
@@ -67,8 +235,9 @@ class ResearchManager:
                 enriched_query = query
 
             # ── Phase 2: PLAN initial searches ──
-            yield {"type": "status", "content": "Planning research strategy..."}
-            search_plan = await self._plan_searches(enriched_query)
+            if search_plan is None:
+                yield {"type": "status", "content": "Planning research strategy..."}
+                search_plan = await self._plan_searches(ctx, enriched_query)
             search_descriptions = [f"- {s.query} ({s.reason})" for s in search_plan.searches]
             yield {
                 "type": "status",
@@ -77,10 +246,10 @@ class ResearchManager:
 
             # ── Phase 3: SEARCH ──
             yield {"type": "status", "content": f"Executing {len(search_plan.searches)} searches in parallel..."}
-            all_search_results = await self._perform_searches(search_plan)
+            ctx.results.extend(await self._perform_searches(ctx, search_plan))
             yield {
                 "type": "status",
-                "content": f"Initial search complete. Got {len(all_search_results)} results.",
+                "content": f"Initial search complete. Got {len(ctx.results)} results.",
             }
 
             # ── Phase 4-6: WRITE → EVALUATE → REFINE loop ──
@@ -93,26 +262,22 @@ class ResearchManager:
                     "type": "status",
                     "content": f"Writing report (iteration {iteration}/{MAX_RESEARCH_ITERATIONS})...",
                 }
-                report = await self._write_report(
-                    enriched_query, all_search_results, previous_evaluation
-                )
+                async for event in self._write_report(ctx, enriched_query, previous_evaluation):
+                    if event["type"] == "token":
+                        yield event
+                    else:
+                        report = event["content"]
+                        word_count = event["word_count"]
                 yield {
                     "type": "status",
-                    "content": f"Draft {iteration} complete ({len(report.markdown_report.split())} words). Evaluating quality...",
+                    "content": f"Draft {iteration} complete ({word_count} words). Evaluating quality...",
                 }
 
-                # ── Phase 5: EVALUATE ──
-                evaluation = await self._evaluate_report(enriched_query, report, all_search_results)
-                scores = (
-                    f"Completeness: {evaluation.completeness_score}/10 | "
-                    f"Depth: {evaluation.depth_score}/10 | "
-                    f"Accuracy: {evaluation.accuracy_score}/10 | "
-                    f"Structure: {evaluation.structure_score}/10 | "
-                    f"Insight: {evaluation.insight_score}/10"
-                )
+                # ── Phase 5: EVALUATE (the evaluator also plans the next searches) ──
+                evaluation = await self._evaluate_report(ctx, enriched_query, report)
                 yield {
                     "type": "status",
-                    "content": f"Evaluation scores: {scores}\n{evaluation.summary_of_evaluation}",
+                    "content": f"Evaluation scores: {format_scores(evaluation)}\n{evaluation.summary_of_evaluation}",
                 }
 
                 if evaluation.is_acceptable:
@@ -130,21 +295,28 @@ class ResearchManager:
                         ),
                     }
 
-                    # Plan and execute additional searches targeting the gaps
-                    refinement_plan = await self._plan_refinement_searches(
-                        enriched_query, evaluation, all_search_results
-                    )
+                    # Use the evaluator's plan, falling back to a separate planning call
+                    refinement_plan = evaluation.next_plan
+                    if refinement_plan is None or not refinement_plan.searches:
+                        refinement_plan = await self._plan_refinement_searches(ctx, enriched_query, evaluation)
+                    # Whichever path produced it, keep the plan within bounds and free of repeats
+                    refinement_plan = _unique_searches(refinement_plan, MAX_REFINEMENT_SEARCHES)
+                    planned = len(refinement_plan.searches)
+                    refinement_plan = await self._drop_duplicate_searches(ctx, refinement_plan)
+                    skipped = planned - len(refinement_plan.searches)
                     yield {
                         "type": "status",
-                        "content": f"Executing {len(refinement_plan.searches)} additional searches...",
+                        "content": (
+                            f"Executing {len(refinement_plan.searches)} additional searches"
+                            + (f" (skipped {skipped} that repeat earlier research)..." if skipped else "...")
+                        ),
                     }
-                    new_results = await self._perform_searches(refinement_plan)
-                    all_search_results.extend(new_results)
+                    ctx.results.extend(await self._perform_searches(ctx, refinement_plan))
                     previous_evaluation = evaluation
 
                     yield {
                         "type": "status",
-                        "content": f"Now have {len(all_search_results)} total search results. Rewriting report...",
+                        "content": f"Now have {len(ctx.results)} total search results. Rewriting report...",
                     }
                 else:
                     yield {
@@ -165,76 +337,201 @@ class ResearchManager:
     # Internal methods
     # ──────────────────────────────────────────────────────────────────────
 
-    async def _plan_searches(self, query: str) -> WebSearchPlan:
+    async def _plan_searches(self, ctx: RunContext, query: str) -> WebSearchPlan:
         """Plan the initial set of searches."""
         print("Planning searches...")
-        result = await Runner.run(planner_agent, f"Query: {query}")
-        plan = result.final_output_as(WebSearchPlan)
+        plan: WebSearchPlan = await cached_run(
+            planner_agent, f"{INITIAL_PLAN_REQUEST}\n\nQuery: {query}", cache=ctx.cache
+        )
         print(f"Planned {len(plan.searches)} searches")
         return plan
 
     async def _plan_refinement_searches(
-        self, query: str, evaluation: EvaluationResult, existing_results: list[str]
+        self, ctx: RunContext, query: str, evaluation: EvaluationResult
     ) -> WebSearchPlan:
         """Plan additional searches to address gaps found by the evaluator."""
         print("Planning refinement searches...")
-        existing_summary = "\n---\n".join(existing_results[:5])  # Don't overflow context
+        existing_summary = _evidence_cards(ctx.results)
         input_text = (
+            f"{REFINEMENT_PLAN_REQUEST}\n\n"
             f"Original query: {query}\n\n"
             f"The evaluator identified these gaps:\n"
             + "\n".join(f"- {g}" for g in evaluation.gaps)
             + f"\n\nEvaluator's suggested searches:\n"
             + "\n".join(f"- {q}" for q in evaluation.additional_search_queries)
             + f"\n\nRevision instructions: {evaluation.revision_instructions}\n\n"
-            f"Summary of existing research (do NOT repeat these):\n{existing_summary[:3000]}"
+            f"Summary of existing research (do NOT repeat these):\n{existing_summary}"
         )
-        result = await Runner.run(refinement_planner_agent, input_text)
-        plan = result.final_output_as(WebSearchPlan)
+        input_text += _cut_short_note(ctx)
+        plan: WebSearchPlan = await cached_run(refinement_planner_agent, input_text, cache=ctx.cache)
         print(f"Planned {len(plan.searches)} refinement searches")
         return plan
 
-    async def _perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
-        """Execute searches in parallel and collect results."""
+    async def _perform_searches(self, ctx: RunContext, search_plan: WebSearchPlan) -> list[SearchSummary]:
+        """
+        Execute searches in parallel and collect results.
+
+        Once enough results are in, a search that has been running for more than
+        SEARCH_SOFT_TIMEOUT_SECONDS is cancelled rather than holding up the whole pipeline.
+        That clock starts when the search gets past the concurrency limit, so searches still
+        queued are never cut; nothing runs past SEARCH_HARD_TIMEOUT_SECONDS.
+        """
         print(f"Executing {len(search_plan.searches)} searches...")
-        tasks = [asyncio.create_task(self._search(item)) for item in search_plan.searches]
+        # Keyed by id(item): when each search acquired the semaphore and actually started
+        started_at: dict[int, float] = {}
+        tasks = {
+            asyncio.create_task(self._search(ctx, item, started_at)): item for item in search_plan.searches
+        }
+        min_useful = max(MIN_USEFUL_RESULTS, 0.7 * len(tasks))
+        start = time.monotonic()
         results = []
-        num_completed = 0
-        for task in asyncio.as_completed(tasks):
-            result = await task
-            if result is not None:
-                results.append(result)
-            num_completed += 1
-            print(f"Search progress: {num_completed}/{len(tasks)}")
+        completed = []
+        succeeded = []
+        cut_short = []
+        pending = set(tasks)
+        while pending:
+            now = time.monotonic()
+            timeout = SEARCH_HARD_TIMEOUT_SECONDS - (now - start)
+            if len(results) >= min_useful:
+                stragglers = {
+                    task for task in pending
+                    if now - started_at.get(id(tasks[task]), now) >= SEARCH_SOFT_TIMEOUT_SECONDS
+                }
+                for task in stragglers:
+                    task.cancel()
+                    cut_short.append(tasks[task].query)
+                pending -= stragglers
+                if not pending:
+                    break
+                # Wake when the next running search hits the soft limit; re-check at least that
+                # often too, since queued searches start as the cancelled ones free their slots
+                deadlines = [
+                    started_at[id(tasks[task])] + SEARCH_SOFT_TIMEOUT_SECONDS - now
+                    for task in pending if id(tasks[task]) in started_at
+                ]
+                timeout = min(timeout, min(deadlines, default=SEARCH_SOFT_TIMEOUT_SECONDS))
+            done, pending = await asyncio.wait(
+                pending, timeout=max(timeout, 0), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                if time.monotonic() - start >= SEARCH_HARD_TIMEOUT_SECONDS:
+                    break
+                continue
+            for task in done:
+                completed.append(tasks[task])
+                result = task.result()
+                if result is not None:
+                    results.append(result)
+                    succeeded.append(tasks[task].query)
+            print(f"Search progress: {len(completed)}/{len(tasks)}")
+
+        retried = {item.query for item in completed}
+        ctx.cut_short_queries = [q for q in ctx.cut_short_queries if q not in retried]
+        for task in pending:
+            task.cancel()
+            cut_short.append(tasks[task].query)
+        if cut_short:
+            ctx.cut_short_queries.extend(cut_short)
+            print(f"Cancelled {len(cut_short)} slow searches: {cut_short}")
         print(f"Completed {len(results)} successful searches")
+
+        # Take every query embedding this round left behind, so those of failed searches don't linger
+        known = {}
+        for item in tasks.values():
+            embedding = ctx.query_embeddings.pop(item.query, None)
+            if embedding is not None:
+                known[item.query] = embedding
+
+        # Only successful searches count as research done; failed ones may be planned again
+        ctx.executed_queries.update(q.strip().lower() for q in succeeded)
+        if succeeded:
+            try:
+                # Reuse the query embeddings from the cache lookup; embed only what's missing
+                missing = [q for q in succeeded if q not in known]
+                new_embeddings = await embed_texts(missing + [r.full_text for r in results])
+                new_embeddings = np.vstack([*(known[q] for q in succeeded if q in known), new_embeddings])
+                ctx.embeddings = (
+                    new_embeddings
+                    if ctx.embeddings.size == 0
+                    else np.vstack([ctx.embeddings, new_embeddings])
+                )
+            except Exception as e:
+                print(f"Embedding search results failed: {e}")
         return results
 
-    async def _search(self, item: WebSearchItem) -> str | None:
-        """Execute a single search."""
+    async def _drop_duplicate_searches(self, ctx: RunContext, search_plan: WebSearchPlan) -> WebSearchPlan:
+        """Drop planned searches that repeat, or closely match, research already done."""
+        searches = [
+            item for item in search_plan.searches
+            if item.query.strip().lower() not in ctx.executed_queries
+        ]
+        if searches and ctx.embeddings.size:
+            try:
+                query_embeddings = await embed_texts([item.query for item in searches])
+            except Exception as e:
+                print(f"Embedding planned searches failed: {e}")
+            else:
+                max_similarity = (query_embeddings @ ctx.embeddings.T).max(axis=1)
+                searches = [
+                    item for item, similarity in zip(searches, max_similarity)
+                    if similarity <= DUPLICATE_SEARCH_THRESHOLD
+                ]
+        dropped = len(search_plan.searches) - len(searches)
+        if dropped:
+            print(f"Dropped {dropped} duplicate searches")
+        return WebSearchPlan(searches=searches)
+
+    async def _search(
+        self, ctx: RunContext, item: WebSearchItem, started_at: dict[int, float]
+    ) -> SearchSummary | None:
+        """Execute a single search, reusing a cached summary for equivalent queries."""
+        async with ctx.sem:
+            started_at[id(item)] = time.monotonic()
+            return await self._search_unbounded(ctx, item)
+
+    async def _search_unbounded(self, ctx: RunContext, item: WebSearchItem) -> SearchSummary | None:
+        try:
+            cached, embedding = await ctx.search_cache.get(item.query)
+            ctx.query_embeddings[item.query] = embedding
+        except Exception as e:
+            print(f"Search cache lookup failed for '{item.query}': {e}")
+            cached, embedding = None, None
+        if cached is not None:
+            try:
+                return SearchSummary.model_validate_json(cached)
+            except ValidationError:
+                pass  # Entry written in an older format; search again and overwrite it
+
         input_text = f"Search term: {item.query}\nReason for searching: {item.reason}"
         try:
             result = await Runner.run(search_agent, input_text)
-            return str(result.final_output)
+            search_result = result.final_output_as(SearchSummary)
         except Exception as e:
             print(f"Search failed for '{item.query}': {e}")
             return None
 
+        try:
+            await ctx.search_cache.put(item.query, search_result.model_dump_json(), embedding)
+        except Exception as e:
+            print(f"Search cache store failed for '{item.query}': {e}")
+        return search_result
+
     async def _write_report(
         self,
+        ctx: RunContext,
         query: str,
-        search_results: list[str],
         previous_evaluation: EvaluationResult | None = None,
-    ) -> ReportData:
-        """Write or revise the research report."""
-        print("Writing report...")
-        input_parts = [
-            f"Original query: {query}",
-            f"\nResearch results ({len(search_results)} sources):",
-        ]
-        for i, result in enumerate(search_results, 1):
-            input_parts.append(f"\n--- Source {i} ---\n{result}")
+    ):
+        """
+        Write or revise the research report, streaming it as it is generated.
 
+        Yields {"type": "token", "content": str} chunks of the markdown report,
+        then {"type": "draft", "content": ReportData, "word_count": int} once it is complete.
+        """
+        print("Writing report...")
+        revision_parts = []
         if previous_evaluation:
-            input_parts.append(
+            revision_parts.append(
                 f"\n\n--- REVISION INSTRUCTIONS ---\n"
                 f"A previous draft was evaluated and found wanting. Here is the feedback:\n"
                 f"Evaluation: {previous_evaluation.summary_of_evaluation}\n"
@@ -243,32 +540,58 @@ class ResearchManager:
                 f"Please write an IMPROVED version that addresses ALL of this feedback."
             )
 
-        input_text = "\n".join(input_parts)
-        result = await Runner.run(writer_agent, input_text)
-        report = result.final_output_as(ReportData)
-        print(f"Report written: {len(report.markdown_report.split())} words")
-        return report
+        input_text = "\n".join(itertools.chain(
+            [f"Original query: {query}", f"\nResearch results ({len(ctx.results)} sources):"],
+            (f"\n--- Source {i} ---\n{result.structured_json()}" for i, result in enumerate(ctx.results, 1)),
+            revision_parts,
+        ))
+        markdown_stream = _JsonStringFieldStream("markdown_report")
+        report = None
+        async for event in cached_run_streamed(writer_agent, input_text, cache=ctx.cache):
+            if event["type"] == "delta":
+                text = markdown_stream.feed(event["content"])
+                if text:
+                    yield {"type": "token", "content": text}
+            else:
+                report = event["content"]
+
+        if not markdown_stream.started:
+            # Served from cache (or the model emitted nothing incrementally)
+            yield {"type": "token", "content": report.markdown_report}
+        word_count = _word_count(report.markdown_report)
+        print(f"Report written: {word_count} words")
+        yield {"type": "draft", "content": report, "word_count": word_count}
 
     async def _evaluate_report(
-        self, query: str, report: ReportData, search_results: list[str]
-    ) -> EvaluationResult:
-        """Evaluate the quality of the research report."""
+        self, ctx: RunContext, query: str, report: ReportData
+    ) -> EvaluationWithPlan:
+        """
+        Evaluate the quality of the research report and, if it falls short, plan the
+        searches that would fill its gaps.
+
+        Two evaluations run in parallel on the cheap evaluator model and are averaged;
+        if they disagree sharply, the report is re-evaluated on the escalation model.
+        """
         print("Evaluating report...")
-        search_summary = "\n---\n".join(search_results[:8])  # Cap to avoid context overflow
+        evidence = _evidence_cards(ctx.results)
         input_text = (
             f"Original query: {query}\n\n"
             f"--- REPORT TO EVALUATE ---\n{report.markdown_report}\n\n"
-            f"--- SEARCH RESULTS USED ---\n{search_summary[:5000]}"
+            f"--- EVIDENCE FROM SEARCH RESULTS USED ---\n{evidence}"
+            + _cut_short_note(ctx)
         )
-        result = await Runner.run(evaluator_agent, input_text)
-        evaluation = result.final_output_as(EvaluationResult)
-        avg_score = (
-            evaluation.completeness_score
-            + evaluation.depth_score
-            + evaluation.accuracy_score
-            + evaluation.structure_score
-            + evaluation.insight_score
-        ) / 5
+        first, second = await asyncio.gather(
+            cached_run(evaluator_agent, input_text, cache=ctx.cache),
+            cached_run(second_evaluator_agent, input_text, cache=ctx.cache),
+        )
+        if scores_disagree(first, second):
+            print("Evaluations disagree; escalating to the stronger evaluator model")
+            evaluation: EvaluationWithPlan = await cached_run(
+                escalation_evaluator_agent, input_text, cache=ctx.cache
+            )
+        else:
+            evaluation = merge_evaluations(first, second)
+        avg_score = average_score(evaluation)
         print(f"Evaluation complete. Average score: {avg_score:.1f}/10. Acceptable: {evaluation.is_acceptable}")
         return evaluation
 
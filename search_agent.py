@@ -1,3 +1,6 @@
+import itertools
+
+from pydantic import BaseModel, Field
 from agents import Agent, WebSearchTool, ModelSettings
 
 INSTRUCTIONS = """You are an expert research analyst performing web searches. Given a search term \
@@ -16,13 +19,50 @@ Write in a dense, information-rich style. No filler, no fluff. Every sentence sh
 substantive information. This will be consumed by a senior analyst synthesizing a comprehensive \
 report, so density and accuracy matter more than readability.
 
-Do not include any additional commentary other than the summary itself.
+Return the summary as `full_text`, and break its substance out into the structured fields:
+- `key_facts`: every substantive finding, one self-contained sentence each, with names and dates, \
+most important first
+- `statistics`: every number, percentage, dollar amount or metric, with what it measures
+- `sources`: the sources cited, by name or URL
+- `publication_dates`: the publication dates of those sources
+- `disagreements`: points where sources disagree, or information that looks outdated or unreliable
+
+The structured fields are what the report writer reads (the evaluator sees only the first few \
+key facts), so they must be complete on their own and must only contain claims that appear in \
+the summary. Include key direct quotes in `key_facts`. Do not include any additional commentary.
 """
 
+# Facts per source shown to the evaluator and refinement planner, which need coverage, not detail
+EVIDENCE_CARD_FACTS = 3
+
+
+class SearchSummary(BaseModel):
+    key_facts: list[str] = Field(description="Every substantive finding, one self-contained sentence each.")
+    statistics: list[str] = Field(description="Every number or metric found, with what it measures.")
+    sources: list[str] = Field(description="Names or URLs of the sources cited.")
+    publication_dates: list[str] = Field(description="Publication dates of the sources, where known.")
+    disagreements: list[str] = Field(
+        description="Points of disagreement between sources, or information that may be outdated or unreliable."
+    )
+    full_text: str = Field(description="The full 300-500 word summary of the search results.")
+
+    def structured_json(self) -> str:
+        """The structured fields as compact JSON, without the full text."""
+        return self.model_dump_json(exclude={"full_text"})
+
+    def evidence_card(self, max_facts: int = EVIDENCE_CARD_FACTS) -> str:
+        """A short card of the leading facts and their provenance, for the evaluator and planner."""
+        return "\n".join(itertools.chain(
+            (f"- {fact}" for fact in self.key_facts[:max_facts]),
+            [f"Sources: {', '.join(self.sources)}", f"Dates: {', '.join(self.publication_dates)}"],
+        ))
+
+
 search_agent = Agent(
     name="SearchAgent",
     instructions=INSTRUCTIONS,
     tools=[WebSearchTool(search_context_size="high")],
     model="gpt-4o-mini",
     model_settings=ModelSettings(tool_choice="required"),
+    output_type=SearchSummary,
 )
@@ -0,0 +1,211 @@
+import atexit
+import os
+import re
+import time
+
+import numpy as np
+import orjson
+from diskcache import Cache, Lock
+
+from disk_cache import CACHE_DIR, disk_cache
+from embeddings import embed_texts
+
+SIMILARITY_THRESHOLD = 0.95
+PROPER_NOUN_OVERLAP_THRESHOLD = 0.8
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60  # Web facts drift; don't serve week-old searches
+INDEX_FLUSH_EVERY = 10  # Write the embedding index sidecar after this many new entries
+
+# Capitalized words, acronyms and numbers — the tokens that make two otherwise
+# similar queries mean different things ("CPC benchmarks" vs "CPM benchmarks", 2024 vs 2025).
+_PROPER_NOUN_PATTERN = re.compile(r"\b(?:[A-Z][\w&.-]*|\d[\d.,%]*)")
+_WORD_PATTERN = re.compile(r"[\w&.%-]+")
+
+
+def _proper_nouns(text: str) -> set[str]:
+    return {token.lower().rstrip(".,") for token in _PROPER_NOUN_PATTERN.findall(text)}
+
+
+def _words(text: str) -> set[str]:
+    return {token.lower().rstrip(".,") for token in _WORD_PATTERN.findall(text)}
+
+
+def _proper_noun_overlap(a: str, b: str) -> float:
+    """
+    Fraction of each query's proper nouns that also appear, in any case, in the other
+    query (1.0 if neither has any). Matching against all words rather than only the
+    other query's proper nouns means sentence case ("Nuclear fusion" vs "nuclear fusion")
+    doesn't count as a difference, while a swapped entity (Nvidia vs Intel) still does.
+    """
+    nouns_a, nouns_b = _proper_nouns(a), _proper_nouns(b)
+    if not nouns_a and not nouns_b:
+        return 1.0
+    words_a, words_b = _words(a), _words(b)
+    shared = len(nouns_a & words_b) + len(nouns_b & words_a)
+    return shared / (len(nouns_a) + len(nouns_b))
+
+
+class SemanticCache:
+    """
+    Semantic cache for web search summaries, keyed on the embedding of the search query.
+
+    A lookup is a hit only when the closest cached query has cosine similarity
+    >= SIMILARITY_THRESHOLD *and* shares most of its proper nouns, so paraphrases
+    are reused but queries that differ in one critical entity are not.
+    Entries expire after CACHE_TTL_SECONDS.
+
+    Results live in the shared on-disk store. The embedding index is kept in a
+    `.npy` matrix plus a `.jsonl` file of (query, created_at) rows next to it; the matrix
+    is memory-mapped so worker processes share its pages. Each process flushes its new
+    entries there periodically and, on a miss, reloads the files if another process
+    has rewritten them.
+    """
+
+    def __init__(
+        self,
+        store: Cache = disk_cache,
+        index_path: str = os.path.join(CACHE_DIR, "semantic_index"),
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+    ):
+        self._store = store
+        self._matrix_path = index_path + ".npy"
+        self._meta_path = index_path + ".jsonl"
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        # Row i of _matrix is the embedding of _queries[i]
+        self._queries: list[str] = []
+        self._created_at: list[float] = []
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._index_version = None
+        self._unflushed = 0
+        self._refresh_index()
+        atexit.register(self.flush)
+
+    def _sidecar_version(self) -> tuple[int, int] | None:
+        """Modification times of the sidecar files, or None if they don't exist yet."""
+        try:
+            return os.stat(self._matrix_path).st_mtime_ns, os.stat(self._meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load_index(self, mmap: bool) -> tuple[list[str], list[float], np.ndarray]:
+        """
+        Read the sidecar index from disk, dropping expired rows.
+
+        Must be called while holding the index lock: flush() replaces the two files one
+        after the other, and reading between the swaps would misalign rows and queries.
+        """
+        empty = ([], [], np.empty((0, 0), dtype=np.float32))
+        if not (os.path.exists(self._matrix_path) and os.path.exists(self._meta_path)):
+            return empty
+        matrix = np.load(self._matrix_path, mmap_mode="r" if mmap else None)
+        with open(self._meta_path, "rb") as f:
+            rows = [orjson.loads(line) for line in f if line.strip()]
+        if len(rows) != len(matrix):
+            # Left misaligned by a crash between the two swaps; rows can't be trusted
+            print("Semantic cache index files disagree; starting with an empty index")
+            return empty
+        keep = [i for i, row in enumerate(rows) if time.time() - row["created_at"] <= self.ttl_seconds]
+        if not keep:
+            return empty
+        if len(keep) < len(matrix):
+            matrix = np.asarray(matrix[keep])
+        return [rows[i]["query"] for i in keep], [rows[i]["created_at"] for i in keep], matrix
+
+    def _merge_with_disk(self, mmap: bool) -> tuple[list[str], list[float], np.ndarray]:
+        """The on-disk index plus this process's entries; call while holding the index lock."""
+        queries, created_at, matrix = self._load_index(mmap=mmap)
+        known = {q: i for i, q in enumerate(queries)}
+        new_rows = []
+        for i, query in enumerate(self._queries):
+            if query in known:
+                created_at[known[query]] = max(created_at[known[query]], self._created_at[i])
+            else:
+                queries.append(query)
+                created_at.append(self._created_at[i])
+                new_rows.append(self._matrix[i])
+        if new_rows:
+            matrix = np.vstack([matrix, *new_rows]) if matrix.size else np.vstack(new_rows)
+        return queries, created_at, matrix
+
+    def _refresh_index(self) -> bool:
+        """
+        Pick up entries other processes have flushed since the index was last read.
+        Returns True if the in-memory index changed.
+        """
+        if self._sidecar_version() == self._index_version:
+            return False
+        with Lock(self._store, "semantic-index-lock"):
+            self._index_version = self._sidecar_version()
+            self._queries, self._created_at, self._matrix = self._merge_with_disk(mmap=True)
+        return True
+
+    def flush(self) -> None:
+        """Merge this process's index into the sidecar files on disk."""
+        if not self._unflushed:
+            return
+        with Lock(self._store, "semantic-index-lock"):
+            queries, created_at, matrix = self._merge_with_disk(mmap=False)
+
+            # Write to temporary files and swap them in, so readers never see a partial file
+            with open(self._matrix_path + ".tmp", "wb") as f:
+                np.save(f, matrix.astype(np.float32))
+            with open(self._meta_path + ".tmp", "wb") as f:
+                for query, ts in zip(queries, created_at):
+                    f.write(orjson.dumps({"query": query, "created_at": ts}) + b"\n")
+            os.replace(self._matrix_path + ".tmp", self._matrix_path)
+            os.replace(self._meta_path + ".tmp", self._meta_path)
+
+            self._queries, self._created_at, self._matrix = queries, created_at, matrix
+            self._index_version = self._sidecar_version()
+        self._unflushed = 0
+
+    async def get(self, query: str) -> tuple[str | None, np.ndarray]:
+        """
+        Return (cached result, query embedding); the result is None on a miss. Pass the
+        embedding on to put() and any other caller that needs it rather than embedding again.
+        """
+        embedding = (await embed_texts([query]))[0]
+        result = self._lookup(query, embedding)
+        # On a miss, check whether other workers have added entries since we last looked
+        if result is None and self._refresh_index():
+            result = self._lookup(query, embedding)
+        return result, embedding
+
+    def _lookup(self, query: str, embedding: np.ndarray) -> str | None:
+        if not self._queries:
+            return None
+        similarities = self._matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        if time.time() - self._created_at[best] > self.ttl_seconds:
+            return None
+        if _proper_noun_overlap(query, self._queries[best]) < PROPER_NOUN_OVERLAP_THRESHOLD:
+            return None
+        result = self._store.get(("search", self._queries[best]))
+        if result is None:  # Expired or evicted from the store
+            return None
+        print(f"Semantic cache hit ({similarities[best]:.3f}): '{query}' ~ '{self._queries[best]}'")
+        return result
+
+    async def put(self, query: str, result: str, embedding: np.ndarray | None = None) -> None:
+        """Store a search result under its query's embedding, computing it if not given."""
+        if embedding is None:
+            embedding = (await embed_texts([query]))[0]
+        created_at = time.time()
+        self._store.set(("search", query), result, expire=self.ttl_seconds)
+
+        if query in self._queries:
+            self._created_at[self._queries.index(query)] = created_at
+        else:
+            self._queries.append(query)
+            self._created_at.append(created_at)
+            self._matrix = embedding[None, :] if self._matrix.size == 0 else np.vstack([self._matrix, embedding])
+
+        self._unflushed += 1
+        if self._unflushed >= INDEX_FLUSH_EVERY:
+            self.flush()
+
+
+search_cache = SemanticCache()